@@ -1,6 +1,30 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+
+def integrate(time, epsilon, neta, activity, rng):
+    """Positions of the particle at each of the given times, starting at the origin"""
+    dt = np.diff(time, prepend=0)
+
+    # After every epsilon time, randomly select a new angular velocity.
+    # The schedule is known in advance, so draw all of them up front and
+    # spread each one over its segment of steps.
+    segment = (time // epsilon).astype(int)
+    angluar_velocity = rng.uniform(-neta, neta, segment[-1] + 1)[segment]
+
+    theta = np.cumsum(angluar_velocity * dt)
+
+    # Work in place so each coordinate uses one buffer and no temporaries
+    step = activity * dt
+    x = np.cos(theta)
+    x *= step
+    np.cumsum(x, out=x)
+    y = np.sin(theta)
+    y *= step
+    np.cumsum(y, out=y)
+    return x, y
+
+
 """
 For time:
 0.01-0.1
@@ -13,44 +37,21 @@ activity = 3
 neta = 3
 epsilon = 0.5
 
-time = np.array([])
+ranges = []
 for i in [0.01, 0.1, 1, 10]:
     number = 10
     if i >= epsilon:
         number = i*10 / epsilon
-    time = np.concatenate((time, np.linspace(i, i*10, int(number))[:-1]))
-
-time = np.append(time, 100)
-
-theta = 0
-angluar_velocity = np.random.uniform(-neta, neta)
-x = np.array([0])
-y = np.array([0])
-msd = np.array([])
-
-prevTime = 0
-for currTime in time:
-    dt = currTime - prevTime
-
-    # After every epsilon time, randomly select a new angular velocity
-    if (currTime % epsilon) == 0.0:
-        angluar_velocity = np.random.uniform(-neta, neta)
-
-    dtheta = angluar_velocity * dt
-    theta = theta + dtheta
-
-    x_dot = activity * np.cos(theta)
-    y_dot = activity * np.sin(theta)
-
-    dx = x_dot * dt
-    dy = y_dot * dt
+    ranges.append(np.linspace(i, i*10, int(number))[:-1])
 
-    x = np.append(x, x[-1] + dx)
-    y = np.append(y, y[-1] + dy)
+ranges.append([100])
+time = np.concatenate(ranges)
 
-    msd = np.append(msd, np.mean((x - x[0])**2 + (y - y[0])**2))
+x, y = integrate(time, epsilon, neta, activity, np.random.default_rng())
 
-    prevTime = currTime
+# Single particle starting at the origin, so the MSD is just the
+# squared displacement
+msd = x**2 + y**2
 
 
 plt.loglog(time, msd)
@@ -1,4 +1,6 @@
+import math
 import tkinter as tk
+from collections import deque
 import numpy as np
 
 import matplotlib.pyplot as plt
@@ -33,32 +35,48 @@ class ParticleSimulation:
         
         # Particle properties
         self.radius = 5
-        self.position = np.array([self.width/2, self.height/2], dtype=float)
-        self.initial_position = self.position.copy()  # Store initial position for MSD calculation
-        self.trail = []  # List to store trail line objects
+        self.x, self.y = self.width/2, self.height/2
+        self.x0, self.y0 = self.x, self.y  # Store initial position for MSD calculation
+        # Wall collision limits for the particle centre
+        self._x_min, self._x_max = self.radius, self.width - self.radius
+        self._y_min, self._y_max = self.radius, self.height - self.radius
+        self.trail_length = 1000  # Max number of trail segments kept on screen (adjust this to control the fade effect)
+        # Flat x, y trail points, the oldest point drops off once full
+        self.trail = deque([self.x, self.y] * 2, maxlen=2 * (self.trail_length + 1))
         
-        # MSD calculation variables
-        self.positions_history = [self.position.copy()]  # Store all positions for MSD calculation
-        self.time_steps = [0]  # Time steps corresponding to positions
+        # MSD calculation variables, recorded every step into preallocated arrays
+        self._cap = 4096  # Preallocated samples, doubled when full
+        self.xs = np.empty(self._cap)  # Positions over time
+        self.ys = np.empty(self._cap)
+        self.msd_values = np.empty(self._cap)  # MSD values over time
+        self.xs[0], self.ys[0], self.msd_values[0] = self.x, self.y, 0
+        self._n = 1
         self.current_time = 0
-        self.msd_values = [0]  # MSD values over time
+        self.info_every = 5  # Frames between info text updates
         
         self.theta = 0.0
+        self.heading = (1.0, 0.0)  # (cos θ, sin θ), advanced by rotation instead of calling cos/sin
+        self.renormalize_every = 256  # Steps between renormalizing the heading
         self.neta = 0.1  # Define the range for angular velocity
-        self.angular_velocity = np.random.uniform(-self.neta, self.neta) 
+        self.rng = np.random.default_rng()
+        self.noise_batch = 256  # Angular velocities drawn per batch
+        self.noise_buffer = np.empty(0)
+        self.noise_index = 0
+        self.set_angular_velocity(self.draw_angular_velocity())
         
         self.epsilon = 500  # Time interval in milliseconds for updating angular velocity
         
         self.speed = 0.4 # Activity
-        self.velocity = np.array([
-            self.speed * np.cos(self.theta),
-            self.speed * np.sin(self.theta)
-        ])
+        self.vx = self.speed * self.heading[0]
+        self.vy = self.speed * self.heading[1]
+        
+        # The trail is a single polyline, redrawn once per frame
+        self.trail_line = self.canvas.create_line(*self.trail, fill='blue', width=1)
         
         # Just paint the particle on the canvas
         self.particle = self.canvas.create_oval(
-            self.position[0]-self.radius, self.position[1]-self.radius,
-            self.position[0]+self.radius, self.position[1]+self.radius,
+            self.x-self.radius, self.y-self.radius,
+            self.x+self.radius, self.y+self.radius,
             fill='red'
         )
 
@@ -72,25 +90,48 @@ class ParticleSimulation:
     
     def update_angular_velocity(self):
         if self.running:
-            self.angular_velocity = np.random.uniform(-self.neta, self.neta)
+            self.set_angular_velocity(self.draw_angular_velocity())
             self.root.after(self.epsilon, self.update_angular_velocity)
 
-    def update_position(self):
-        prev_position = self.position.copy()  # Store previous position
+    def draw_angular_velocity(self):
+        """Next angular velocity from a batch drawn in advance, refilled when used up"""
+        if self.noise_index == len(self.noise_buffer):
+            self.noise_buffer = self.rng.uniform(-self.neta, self.neta, self.noise_batch)
+            self.noise_index = 0
+        angular_velocity = float(self.noise_buffer[self.noise_index])
+        self.noise_index += 1
+        return angular_velocity
 
+    def set_angular_velocity(self, angular_velocity):
+        """Set the angular velocity and the rotation it applies each step"""
+        self.angular_velocity = angular_velocity
+        self.rotation = (math.cos(angular_velocity), math.sin(angular_velocity))
+
+    def update_position(self):
+        # The turn per step is constant between angular velocity updates, so
+        # rotate the heading vector rather than evaluating cos/sin of theta
         self.theta += self.angular_velocity
-        self.velocity = np.array([
-            self.speed * np.cos(self.theta),
-            self.speed * np.sin(self.theta)
-        ])
+        c, s = self.heading
+        rc, rs = self.rotation
+        c, s = c*rc - s*rs, s*rc + c*rs
 
-        self.position += self.velocity
+        # Keep rounding errors from drifting the heading off unit length
+        if self.current_time % self.renormalize_every == 0:
+            norm = math.hypot(c, s)
+            c, s = c/norm, s/norm
+        self.heading = (c, s)
+
+        self.vx = self.speed * c
+        self.vy = self.speed * s
+
+        self.x += self.vx
+        self.y += self.vy
         
         # Check for collisions with walls (currently stopping at walls)
-        if (self.position[0] - self.radius <= 0 or self.position[0] + self.radius >= self.width) or (self.position[1] - self.radius <= 0 or self.position[1] + self.radius >= self.height):
-            self.velocity[0] = 0
-            self.velocity[1] = 0
-            self.angular_velocity = 0
+        if not (self._x_min < self.x < self._x_max and self._y_min < self.y < self._y_max):
+            self.vx = 0
+            self.vy = 0
+            self.set_angular_velocity(0)
             self.speed = 0
             self.running = False
             self.stop_button.config(text="Stopped")
@@ -98,48 +139,50 @@ class ParticleSimulation:
 
         # Update MSD calculation data
         self.current_time += 1
-        self.positions_history.append(self.position.copy())
-        self.time_steps.append(self.current_time)
+        if self._n == self._cap:
+            self._cap *= 2
+            self.xs = np.resize(self.xs, self._cap)
+            self.ys = np.resize(self.ys, self._cap)
+            self.msd_values = np.resize(self.msd_values, self._cap)
+        self.xs[self._n] = self.x
+        self.ys[self._n] = self.y
         
         # Calculate current MSD
-        displacement = self.position - self.initial_position
-        squared_displacement = np.sum(displacement**2)
-        self.msd_values.append(squared_displacement)
-        
-        # Draw trail (line from previous position to new position)
-        trail_segment = self.canvas.create_line(
-            prev_position[0], prev_position[1], self.position[0], self.position[1],
-            fill='blue', width=1
-        )
-        self.trail.append(trail_segment)
-
-        # Optional: Limit trail length for visual clarity
-        if len(self.trail) > 1000:  # Adjust this to control the fade effect
-            self.canvas.delete(self.trail.pop(0))
+        self.msd_values[self._n] = (self.x - self.x0)**2 + (self.y - self.y0)**2
+        self._n += 1
+        
+        # Extend trail (drawn in animate)
+        self.trail.append(self.x)
+        self.trail.append(self.y)
     
     def animate(self):
         if self.running:
             self.update_position()
             
             # Display on canvas
-            self.canvas.coords(
-                self.particle,
-                self.position[0]-self.radius, self.position[1]-self.radius,
-                self.position[0]+self.radius, self.position[1]+self.radius
-            )
+            canvas = self.canvas
+            x, y, r = self.x, self.y, self.radius
+            canvas.coords(self.trail_line, *self.trail)
+            canvas.coords(self.particle, x-r, y-r, x+r, y+r)
 
-            self.canvas.itemconfig(
-                self.info_text,
-                text=f'Position: ({self.position[0]:.1f}, {self.position[1]:.1f})\n'
-                     f'Theta: {self.theta:.2f}\n'
-                     f'Angular Velocity: {self.angular_velocity:.2f}\n'
-                     f'Velocity: ({self.velocity[0]:.2f}, {self.velocity[1]:.2f})\n'
-                     f'Time: {self.current_time}\n'
-                     f'Current MSD: {self.msd_values[-1]:.2f}'
-            )
+            # Text rendering is slow in Tk, so only refresh it every few frames
+            # (and always on the last one)
+            if self.current_time % self.info_every == 0 or not self.running:
+                self.update_info()
 
             self.root.after(16, self.animate)  # Update roughly every 16ms (60 FPS)
     
+    def update_info(self):
+        self.canvas.itemconfig(
+            self.info_text,
+            text=f'Position: ({self.x:.1f}, {self.y:.1f})\n'
+                 f'Theta: {self.theta:.2f}\n'
+                 f'Angular Velocity: {self.angular_velocity:.2f}\n'
+                 f'Velocity: ({self.vx:.2f}, {self.vy:.2f})\n'
+                 f'Time: {self.current_time}\n'
+                 f'Current MSD: {self.msd_values[self._n - 1]:.2f}'
+        )
+    
     def toggle_simulation(self):
         self.running = not self.running
         if self.running:
@@ -149,25 +192,16 @@ class ParticleSimulation:
         else:
             self.stop_button.config(text="Stopped")
             self.plot_button.config(state=tk.NORMAL)
+            self.update_info()
 
     def calculate_msd(self):
         """Calculate MSD for all time intervals"""
-        time_points = np.array(self.time_steps)
-        positions = np.array(self.positions_history)
+        time_points = np.arange(self._n)  # One sample per time step
         
-        # Calculate ensemble-averaged MSD (here we only have one particle, so it's just the squared displacement)
-        msd = np.zeros_like(time_points, dtype=float)
+        # Ensemble-averaged MSD (here we only have one particle, so it's just the
+        # squared displacement, already recorded at every step in update_position)
+        msd = self.msd_values[:self._n]
         
-        # For each time point, calculate MSD
-        for i, t in enumerate(time_points):
-            if i == 0:
-                msd[i] = 0
-                continue
-                
-            # Calculate squared displacement from initial position
-            displacement = positions[i] - positions[0]
-            msd[i] = np.sum(displacement**2)
-            
         return time_points, msd
     
     def open_plot_window(self):
@@ -182,7 +216,8 @@ class ParticleSimulation:
         self.plot_window.geometry("800x600")
         
         # Create matplotlib figure and canvas for MSD plot
-        fig = Figure(figsize=(8, 6), dpi=100)
+        # Constrained layout is solved while drawing, no extra tight_layout pass
+        fig = Figure(figsize=(8, 6), dpi=100, constrained_layout=True)
         ax = fig.add_subplot(111)
         canvas_plot = FigureCanvasTkAgg(fig, master=self.plot_window)
         canvas_plot.get_tk_widget().pack(fill=tk.BOTH, expand=True)
@@ -236,7 +271,6 @@ class ParticleSimulation:
         if len(time_points) > 10:
             ax.legend()
             
-        fig.tight_layout()
         canvas_plot.draw()
         
         # Add save button
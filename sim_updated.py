@@ -1,8 +1,50 @@
+import math
 import tkinter as tk
 import numpy as np
+from scipy.fft import rfft, irfft
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+
+def _autocorr_fft(x):
+    """Autocorrelation of x for every lag, averaged over time origins"""
+    n = len(x)
+    # Zero-pad to 2N so the circular correlation doesn't wrap around.
+    # workers=-1 spreads the transforms over all cores.
+    f = rfft(x, n=2*n, workers=-1)
+    acf = irfft(f * f.conjugate(), n=2*n, overwrite_x=True, workers=-1)[:n]
+    return acf / (n - np.arange(n))
+
+
+def _msd_fft(xs, ys):
+    """Time-averaged MSD of an unwrapped trajectory for every lag in O(N log N)"""
+    n = len(xs)
+    # S1 - 2*S2 cancels heavily, so work in float64 relative to the first sample
+    xs = xs - np.float64(xs[0])
+    ys = ys - np.float64(ys[0])
+    d = xs**2 + ys**2
+    s2 = _autocorr_fft(xs) + _autocorr_fft(ys)
+    
+    # S1(m) = (sum of D over all origins except the first m and last m) / (N - m)
+    cumsum = np.concatenate(([0.0], np.cumsum(d)))
+    m = np.arange(n)
+    s1 = (2*cumsum[-1] - cumsum[m] - (cumsum[-1] - cumsum[n - m])) / (n - m)
+    return s1 - 2*s2
+
+
+def _msd_direct(xs, ys, max_tau):
+    """Time-averaged MSD for lags below max_tau, averaging over every time origin explicitly"""
+    msd = np.zeros(max_tau)
+    for tau_idx in range(1, max_tau):
+        # Displacements over this time lag from every time origin
+        dx = xs[tau_idx:] - xs[:-tau_idx]
+        dy = ys[tau_idx:] - ys[:-tau_idx]
+        
+        # Average squared displacement for this time lag
+        msd[tau_idx] = (np.dot(dx, dx) + np.dot(dy, dy)) / len(dx)
+    return msd
+
+
 class ParticleSimulation:
     def __init__(self, root):
         self.root = root
@@ -55,21 +97,41 @@ class ParticleSimulation:
         # Simulation variables
         self.running = False
         self.particle = None
-        self.trail = []
+        self.trail = []  # polyline items making up the trail
+        self.trail_coords = []  # flat x, y list of the newest trail polyline
+        self.trail_chunk = 500  # points per trail polyline before starting a new one
         self.plot_window = None
         
         # ABP properties
         self.radius = 5  # visual radius of particle
-        self.position = None
+        self.x = None
+        self.y = None
+        self.wraps_x = 0  # net periodic boundary crossings, to unwrap recorded positions
+        self.wraps_y = 0
         self.theta = None
+        self.heading = None  # (cos θ, sin θ), advanced by rotation instead of calling cos/sin
         self.angular_velocity = None
+        self.rotation = None  # (cos, sin) of the turn made in one time step
+        self.renormalize_every = 256  # steps between renormalizing the heading
+        self.rng = np.random.default_rng()
+        self.noise_batch = 256  # angular velocities drawn per batch
+        self.noise_buffer = np.empty(0)
+        self.noise_index = 0
         self.dt = 0.01  # time step for simulation (much smaller than delay time)
+        self.substeps = 4  # simulation steps per rendered frame
+        self.frame_delay = 40  # ms between frames, keeps substeps * dt in real time
+        self.info_every = 5  # frames between info text updates
         
         # Data collection for MSD
-        self.positions_history = []
+        # Unwrapped positions are stored as separate float32 x and y arrays
+        self.xs = np.empty(0, dtype=np.float32)
+        self.ys = np.empty(0, dtype=np.float32)
+        self._cap = 0
+        self._n = 0
         self.time_points = []
         self.current_time = 0
         self.update_counter = 0
+        self.frame_count = 0
         self.next_noise_update = 0
         
     def start_simulation(self):
@@ -85,25 +147,36 @@ class ParticleSimulation:
             # Reset simulation state
             self.canvas.delete("all")
             self.info_text = self.canvas.create_text(10, 10, anchor='nw', text='', font=('Arial', 10), fill='black')
-            self.trail = []
             
             # Initialize particle
-            self.position = np.array([self.width/2, self.height/2], dtype=float)
+            self.x, self.y = self.width/2, self.height/2
+            self.wraps_x = self.wraps_y = 0
+            self.trail = []
+            self.start_trail()
             self.theta = 0.0
-            self.angular_velocity = np.random.uniform(-self.eta, self.eta)
+            self.heading = (1.0, 0.0)
+            self.noise_buffer = np.empty(0)  # η may have changed, discard old draws
+            self.noise_index = 0
+            self.set_angular_velocity(self.draw_angular_velocity())
             
             # Draw particle
             self.particle = self.canvas.create_oval(
-                self.position[0]-self.radius, self.position[1]-self.radius,
-                self.position[0]+self.radius, self.position[1]+self.radius,
+                self.x-self.radius, self.y-self.radius,
+                self.x+self.radius, self.y+self.radius,
                 fill='red', outline='black'
             )
             
             # Data collection
-            self.positions_history = [self.position.copy()]
+            self._cap = 4096  # preallocated samples, doubled when full
+            self.xs = np.empty(self._cap, dtype=np.float32)
+            self.ys = np.empty(self._cap, dtype=np.float32)
+            self.xs[0] = self.x
+            self.ys[0] = self.y
+            self._n = 1
             self.time_points = [0]
             self.current_time = 0
             self.update_counter = 0
+            self.frame_count = 0
             self.next_noise_update = self.epsilon  # Time for next noise update
             
             # UI state
@@ -123,82 +196,144 @@ class ParticleSimulation:
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
         self.plot_button.config(state=tk.NORMAL)
+        self.update_info()
     
     def animate(self):
         if not self.running:
             return
         
-        # Update particle position according to ABP model
-        self.update_position()
-        self.current_time += self.dt
-        self.update_counter += 1
-        
-        # Record position for MSD calculation (not every step to save memory)
-        if self.update_counter % 10 == 0:  # record every 10 steps
-            self.positions_history.append(self.position.copy())
-            self.time_points.append(self.current_time)
-        
-        # Update noise parameter after delay time ε
-        if self.current_time * 1000 >= self.next_noise_update:
-            self.angular_velocity = np.random.uniform(-self.eta, self.eta)
-            self.next_noise_update += self.epsilon
+        # Run several simulation steps per frame, then draw once
+        step = self.step
+        for _ in range(self.substeps):
+            step()
         
         # Update display
-        self.canvas.coords(
-            self.particle,
-            self.position[0]-self.radius, self.position[1]-self.radius,
-            self.position[0]+self.radius, self.position[1]+self.radius
-        )
+        canvas = self.canvas
+        x, y, r = self.x, self.y, self.radius
+        canvas.coords(self.trail[-1], *self.trail_coords)
+        canvas.coords(self.particle, x-r, y-r, x+r, y+r)
+        
+        # Text rendering is slow in Tk, so only refresh it every few frames
+        self.frame_count += 1
+        if self.frame_count % self.info_every == 0:
+            self.update_info()
         
-        # Update info text
+        # Continue animation
+        self.root.after(self.frame_delay, self.animate)  # update approximately 25 fps
+    
+    def update_info(self):
         dr_estimate = f"{self.Dr_theoretical:.4f}" if hasattr(self, 'Dr_theoretical') else "N/A"
         self.canvas.itemconfig(
             self.info_text,
             text=f'Time: {self.current_time:.2f}s\n'
-                 f'Position: ({self.position[0]:.1f}, {self.position[1]:.1f})\n'
+                 f'Position: ({self.x:.1f}, {self.y:.1f})\n'
                  f'Orientation: {np.degrees(self.theta):.1f}°\n'
                  f'Speed: {self.v:.2f}\n'
                  f'Angular velocity: {self.angular_velocity:.2f} rad/s\n'
                  f'Theoretical Dr: {dr_estimate}'
         )
+    
+    def step(self):
+        """Advance the simulation by one time step dt"""
+        # Update particle position according to ABP model
+        self.update_position()
+        self.current_time += self.dt
+        self.update_counter += 1
         
-        # Continue animation
-        self.root.after(10, self.animate)  # update approximately 100 fps
+        # Record position for MSD calculation (not every step to save memory)
+        if self.update_counter % 10 == 0:  # record every 10 steps
+            if self._n == self._cap:
+                self._cap *= 2
+                self.xs = np.resize(self.xs, self._cap)
+                self.ys = np.resize(self.ys, self._cap)
+            self.xs[self._n] = self.x + self.wraps_x * self.width
+            self.ys[self._n] = self.y + self.wraps_y * self.height
+            self._n += 1
+            self.time_points.append(self.current_time)
+        
+        # Update noise parameter after delay time ε
+        if self.current_time * 1000 >= self.next_noise_update:
+            self.set_angular_velocity(self.draw_angular_velocity())
+            self.next_noise_update += self.epsilon
+    
+    def draw_angular_velocity(self):
+        """Next angular velocity from a batch drawn in advance, refilled when used up"""
+        if self.noise_index == len(self.noise_buffer):
+            self.noise_buffer = self.rng.uniform(-self.eta, self.eta, self.noise_batch)
+            self.noise_index = 0
+        angular_velocity = float(self.noise_buffer[self.noise_index])
+        self.noise_index += 1
+        return angular_velocity
+    
+    def set_angular_velocity(self, angular_velocity):
+        """Set the angular velocity and the rotation it applies each time step"""
+        self.angular_velocity = angular_velocity
+        dtheta = angular_velocity * self.dt
+        self.rotation = (math.cos(dtheta), math.sin(dtheta))
+    
+    def start_trail(self):
+        """Start a new trail polyline at the current position"""
+        if self.trail:
+            # Flush the finished polyline, it is not touched again
+            self.canvas.coords(self.trail[-1], *self.trail_coords)
+        
+        x, y = self.x, self.y
+        self.trail_coords = [x, y, x, y]
+        self.trail.append(self.canvas.create_line(*self.trail_coords, fill='blue', width=1))
     
     def update_position(self):
-        # Store previous position for trail
-        prev_position = self.position.copy()
-        
-        # Update orientation based on current angular velocity
+        # Update orientation based on current angular velocity. The turn per
+        # step is constant between noise updates, so rotate the heading
+        # vector rather than evaluating cos/sin of theta every step.
         self.theta += self.angular_velocity * self.dt
+        c, s = self.heading
+        rc, rs = self.rotation
+        c, s = c*rc - s*rs, s*rc + c*rs
+        
+        # Keep rounding errors from drifting the heading off unit length
+        if self.update_counter % self.renormalize_every == 0:
+            norm = math.hypot(c, s)
+            c, s = c/norm, s/norm
+        self.heading = (c, s)
         
         # Calculate new position (constant speed v along orientation)
-        velocity = np.array([
-            self.v * np.cos(self.theta),
-            self.v * np.sin(self.theta)
-        ])
+        step = self.v * self.dt
         
         # Update position
-        self.position += velocity * self.dt
+        self.x += step * c
+        self.y += step * s
         
         # Handle boundary conditions - periodic boundary like in the paper
         # This is crucial for proper MSD calculation
-        if self.position[0] < 0:
-            self.position[0] += self.width
-        elif self.position[0] > self.width:
-            self.position[0] -= self.width
+        wrapped = False
+        if self.x < 0:
+            self.x += self.width
+            self.wraps_x -= 1
+            wrapped = True
+        elif self.x > self.width:
+            self.x -= self.width
+            self.wraps_x += 1
+            wrapped = True
             
-        if self.position[1] < 0:
-            self.position[1] += self.height
-        elif self.position[1] > self.height:
-            self.position[1] -= self.height
-        
-        # Draw trail
-        trail_segment = self.canvas.create_line(
-            prev_position[0], prev_position[1], self.position[0], self.position[1],
-            fill='blue', width=1
-        )
-        self.trail.append(trail_segment)
+        if self.y < 0:
+            self.y += self.height
+            self.wraps_y -= 1
+            wrapped = True
+        elif self.y > self.height:
+            self.y -= self.height
+            self.wraps_y += 1
+            wrapped = True
+        
+        # Extend the trail, it is drawn once per frame in animate.
+        # Don't connect across a wrap, and cap the polyline length so
+        # redrawing it stays cheap.
+        if wrapped:
+            self.start_trail()
+        else:
+            self.trail_coords.append(self.x)
+            self.trail_coords.append(self.y)
+            if len(self.trail_coords) >= 2 * self.trail_chunk:
+                self.start_trail()
     
     def calculate_theoretical_msd(self, times):
         """Calculate theoretical MSD according to paper equation (4)"""
@@ -207,41 +342,29 @@ class ParticleSimulation:
         
         return 2 * (v**2 / Dr) * (times + (1/Dr) * (np.exp(-Dr * times) - 1))
     
-    def calculate_msd(self):
-        """Calculate MSD from simulation data using time-averaged method"""
-        positions = np.array(self.positions_history)
+    def calculate_msd(self, method='fft'):
+        """Calculate MSD from simulation data using time-averaged method
+        
+        method='fft' uses the FFT autocorrelation algorithm, method='direct'
+        averages over every time origin explicitly and is kept as a reference.
+        """
+        xs = self.xs[:self._n]
+        ys = self.ys[:self._n]
         times = np.array(self.time_points)
-        n_points = len(positions)
+        n_points = self._n
         
         # Calculate time differences
         max_tau_idx = min(n_points, 1000)  # Limit the max lag time to analyze
-        tau_values = []
-        msd_values = []
         
-        for tau_idx in range(1, max_tau_idx):
-            # Calculate the time lag
-            tau = times[tau_idx] - times[0]
-            
-            # Calculate MSD for this time lag
-            squared_displacements = []
-            for i in range(n_points - tau_idx):
-                disp = positions[i + tau_idx] - positions[i]
-                
-                # Handle periodic boundary crossings - adjust displacement
-                if abs(disp[0]) > self.width/2:
-                    disp[0] = self.width - abs(disp[0])
-                if abs(disp[1]) > self.height/2:
-                    disp[1] = self.height - abs(disp[1])
-                    
-                squared_displacements.append(np.sum(disp**2))
-            
-            # Average squared displacement for this time lag
-            if squared_displacements:
-                msd = np.mean(squared_displacements)
-                tau_values.append(tau)
-                msd_values.append(msd)
+        # Positions are recorded unwrapped, so no periodic boundary correction is needed
+        if method == 'fft':
+            msd_values = _msd_fft(xs, ys)
+        elif method == 'direct':
+            msd_values = _msd_direct(xs, ys, max_tau_idx)
+        else:
+            raise ValueError(f"Unknown MSD method: {method}")
         
-        return np.array(tau_values), np.array(msd_values)
+        return times[1:max_tau_idx] - times[0], msd_values[1:max_tau_idx]
     
     def plot_msd(self):
         # Close existing plot window if it exists
@@ -254,7 +377,8 @@ class ParticleSimulation:
         self.plot_window.geometry("800x600")
         
         # Create matplotlib figure
-        fig = Figure(figsize=(8, 6), dpi=100)
+        # Constrained layout is solved while drawing, no extra tight_layout pass
+        fig = Figure(figsize=(8, 6), dpi=100, constrained_layout=True)
         ax = fig.add_subplot(111)
         canvas = FigureCanvasTkAgg(fig, master=self.plot_window)
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
@@ -303,11 +427,10 @@ class ParticleSimulation:
         ax.legend()
         ax.grid(True, which="both", linestyle='--', alpha=0.5)
         
-        # Add parameter information
+        # Add parameter information (as a figure-level label so the layout makes room for it)
         param_text = f"Parameters: v = {self.v}, η = {self.eta}, ε = {self.epsilon/1000}s"
-        fig.text(0.5, 0.01, param_text, ha='center')
+        fig.supxlabel(param_text, fontsize='medium')
         
-        fig.tight_layout(rect=[0, 0.03, 1, 1])
         canvas.draw()
         
         # Add save button